@@ -27,11 +27,17 @@
 
 import os
 import sys
+import stat
 import optparse
+import collections
 import subprocess
 import shutil
 import re
 import tarfile
+import urllib
+import urlparse
+import threading
+import Queue
 
 
 # CVS and Subversion command line client commands
@@ -39,28 +45,56 @@ CVS_CMD = 'cvs'
 SVN_CMD = 'svn'
 HG_CMD = 'hg'
 GIT_CMD = 'git'
+DIFF_CMD = 'diff'
+RM_CMD = 'rm'
+
+# The number of bytes of each file to read at a time when comparing
+# file contents:
+COMPARE_BLOCK_SIZE = 1024 * 1024
+
+# Serializes output from the threads used by --jobs:
+output_lock = threading.Lock()
+
+
+def write(msg):
+  """Write MSG to stdout and flush it, without interleaving with other
+  threads' output."""
+
+  output_lock.acquire()
+  try:
+    sys.stdout.write(msg)
+    sys.stdout.flush()
+  finally:
+    output_lock.release()
 
 
 def pipe(cmd):
   """Run cmd as a pipe.  Return (output, status)."""
-  child = subprocess.Popen(cmd, stdout=subprocess.PIPE)
-  output = child.stdout.read()
-  status = child.wait()
-  return (output, status)
+  child = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=-1)
+  output = child.communicate()[0]
+  return (output, child.returncode)
 
 
 def cmd_failed(cmd, output, status):
-  print 'CMD FAILED:', ' '.join(cmd)
-  print 'Output:'
-  sys.stdout.write(output)
+  write('CMD FAILED: %s\nOutput:\n%s' % (' '.join(cmd), output,))
   raise RuntimeError('%s command failed!' % cmd[0])
 
 
 def split_output(cmd):
-  (output, status) = pipe(cmd)
+  """Run cmd as a pipe.  Return its output as a list of lines.
+
+  The lines are read from the pipe one at a time, so the output is
+  never held in memory as a single string."""
+
+  child = subprocess.Popen(cmd, stdout=subprocess.PIPE, bufsize=-1)
+  retval = []
+  for line in child.stdout:
+    if line.endswith(os.linesep):
+      line = line[:-len(os.linesep)]
+    retval.append(line)
+  status = child.wait()
   if status:
-    cmd_failed(cmd, output, status)
-  retval = output.split(os.linesep)[:-1]
+    cmd_failed(cmd, ''.join([line + os.linesep for line in retval]), status)
   if retval and not retval[-1]:
     del retval[-1]
   return retval
@@ -78,13 +112,12 @@ class CvsRepos:
       self.module = "."
       self.cvsroot = path
     else:
-      self.cvsroot = os.path.dirname(path)
-      self.module = os.path.basename(path)
+      (self.cvsroot, self.module) = os.path.split(path)
       while not os.path.exists(os.path.join(self.cvsroot, 'CVSROOT')):
-        parent = os.path.dirname(self.cvsroot)
+        (parent, name) = os.path.split(self.cvsroot)
         if parent == self.cvsroot:
           raise RuntimeError('Cannot find the CVSROOT')
-        self.module = os.path.join(os.path.basename(self.cvsroot), self.module)
+        self.module = os.path.join(name, self.module)
         self.cvsroot = parent
 
   def __str__(self):
@@ -113,33 +146,33 @@ class SvnRepos:
 
   def __init__(self, url):
     """Open the Subversion repository at URL."""
-    # Check if the user supplied an URL or a path
-    if url.find('://') == -1:
-      abspath = os.path.abspath(url)
-      url = 'file://' + (abspath[0] != '/' and '/' or '') + abspath
-      if os.sep != '/':
-        url = url.replace(os.sep, '/')
+    # Check if the user supplied an URL or a path.  (Don't use urlparse
+    # for this, as it would take a Windows drive letter for a scheme.)
+    if '://' not in url:
+      url = urlparse.urljoin(
+          'file:', urllib.pathname2url(os.path.abspath(url))
+          )
 
     self.url = url
 
-    # Cache a list of all tags and branches
-    list = self.list('')
-    if 'tags' in list:
-      self.tag_list = self.list('tags')
-    else:
-      self.tag_list = []
-    if 'branches' in list:
-      self.branch_list = self.list('branches')
-    else:
-      self.branch_list = []
+    # svn is run many times, possibly concurrently (see --jobs), so
+    # it must never stop to prompt for anything:
+    self.base_cmd = [SVN_CMD, '--non-interactive']
+
+    # The tags and branches are only listed when they are first asked
+    # for, since verifying a single trunk/tag/branch doesn't need them:
+    self._top_level = None              # cache result of list('')
+    self._tags = None                   # cache result of tags()
+    self._branches = None               # cache result of branches()
 
   def __str__(self):
-    return self.url.split('/')[-1]
+    # self.url may be percent-encoded (see __init__):
+    return urllib.unquote(self.url.split('/')[-1])
 
   def export(self, path, dest_path):
     """Export PATH to DEST_PATH."""
     url = '/'.join([self.url, path])
-    cmd = [SVN_CMD, 'export', '-q', url, dest_path]
+    cmd = self.base_cmd + ['export', '-q', url, dest_path]
     (output, status) = pipe(cmd)
     if status or output:
       cmd_failed(cmd, output, status)
@@ -158,20 +191,32 @@ class SvnRepos:
 
   def list(self, path):
     """Return a list of all files and directories in PATH."""
-    cmd = [SVN_CMD, 'ls', self.url + '/' + path]
-    entries = []
-    for line in split_output(cmd):
-      if line:
-        entries.append(line.rstrip('/'))
-    return entries
+    cmd = self.base_cmd + ['ls', self.url + '/' + path]
+    return [line.rstrip('/') for line in split_output(cmd) if line]
+
+  def _list_top_level_dir(self, path):
+    """Return a list of the entries in the top-level directory PATH.
+
+    Return an empty list if there is no such directory."""
+
+    if self._top_level is None:
+      self._top_level = self.list('')
+    if path in self._top_level:
+      return self.list(path)
+    else:
+      return []
 
   def tags(self):
     """Return a list of all tags in the repository."""
-    return self.tag_list
+    if self._tags is None:
+      self._tags = self._list_top_level_dir('tags')
+    return self._tags
 
   def branches(self):
     """Return a list of all branches in the repository."""
-    return self.branch_list
+    if self._branches is None:
+      self._branches = self._list_top_level_dir('branches')
+    return self._branches
 
 
 class HgRepos:
@@ -341,7 +386,7 @@ def transform_symbol(ctx, name):
   for (pattern, replacement) in ctx.symbol_transforms:
     newname = pattern.sub(replacement, name)
     if newname != name:
-      print "   symbol '%s' transformed to '%s'" % (name, newname)
+      write("   symbol '%s' transformed to '%s'\n" % (name, newname))
       name = newname
 
   return name
@@ -358,57 +403,114 @@ class Failures(object):
     return "<%s at 0x%x: %s>" % (self.__class__.__name__, id(self), self.count)
 
   def report(self, summary, details=None):
-    self.count += 1
-    sys.stdout.write(' FAIL: %s\n' % summary)
-    if details:
-      for line in details:
-        sys.stdout.write('  %s\n' % line)
+    output_lock.acquire()
+    try:
+      self.count += 1
+      sys.stdout.write(' FAIL: %s\n' % summary)
+      if details:
+        for line in details:
+          sys.stdout.write('  %s\n' % line)
+    finally:
+      output_lock.release()
 
   def __nonzero__(self):
     return self.count > 0
 
 
-def file_compare(failures, base1, base2, run_diff, rel_path):
+def report_contents_differ(failures, base1, base2, run_diff, rel_path):
+  """Report that the contents of the file at REL_PATH differ.
+
+  If RUN_DIFF is set, include the output of 'diff -u' in the report."""
+
+  if run_diff:
+    cmd = [DIFF_CMD, '-u',
+           os.path.join(base1, rel_path), os.path.join(base2, rel_path)]
+    (output, status) = pipe(cmd)
+    diff = output.split(os.linesep)
+  else:
+    diff = None
+  failures.report('File contents differ for %s' % rel_path,
+                  details=diff)
+
+
+def read_block(fd):
+  """Read COMPARE_BLOCK_SIZE bytes from FD, or fewer only at EOF.
+
+  A single os.read() may legitimately return less than requested
+  (e.g., on network filesystems), so keep reading until the block is
+  full."""
+
+  chunks = []
+  size = 0
+  while size < COMPARE_BLOCK_SIZE:
+    data = os.read(fd, COMPARE_BLOCK_SIZE - size)
+    if not data:
+      break
+    chunks.append(data)
+    size += len(data)
+  return ''.join(chunks)
+
+
+def contents_equal(path1, path2):
+  """Return True iff the files at PATH1 and PATH2 have the same contents.
+
+  The files are read in large blocks using read_block(), which keeps
+  the number of Python-level iterations small and bypasses the
+  buffering of Python file objects."""
+
+  # O_BINARY only exists (and matters) on Windows:
+  flags = os.O_RDONLY | getattr(os, 'O_BINARY', 0)
+  fd1 = os.open(path1, flags)
+  try:
+    fd2 = os.open(path2, flags)
+    try:
+      while True:
+        data1 = read_block(fd1)
+        data2 = read_block(fd2)
+        if data1 != data2:
+          return False
+        if not data1:
+          # eof
+          return True
+    finally:
+      os.close(fd2)
+  finally:
+    os.close(fd1)
+
+
+def file_compare(
+      failures, base1, base2, run_diff, rel_path, stat1=None, stat2=None
+      ):
   """Compare the mode and contents of two files.
 
   The paths are specified as two base paths BASE1 and BASE2, and a
-  path REL_PATH that is relative to the two base paths.  Return True
-  iff the file mode and contents are identical."""
+  path REL_PATH that is relative to the two base paths.  STAT1 and
+  STAT2 are the results of os.stat() for the two files, if the caller
+  already has them.  Return True iff the file mode and contents are
+  identical."""
 
   ok = True
   path1 = os.path.join(base1, rel_path)
   path2 = os.path.join(base2, rel_path)
-  mode1 = os.stat(path1).st_mode & 0700   # only look at owner bits
-  mode2 = os.stat(path2).st_mode & 0700
+  if stat1 is None:
+    stat1 = os.stat(path1)
+  if stat2 is None:
+    stat2 = os.stat(path2)
+  mode1 = stat1.st_mode & 0700   # only look at owner bits
+  mode2 = stat2.st_mode & 0700
   if mode1 != mode2:
     failures.report('File modes differ for %s' % rel_path,
                     details=['%s: %o' % (path1, mode1),
                              '%s: %o' % (path2, mode2)])
     ok = False
 
-  file1 = open(path1, 'rb')
-  file2 = open(path2, 'rb')
-  try:
-    while True:
-      data1 = file1.read(8192)
-      data2 = file2.read(8192)
-      if data1 != data2:
-        if run_diff:
-          cmd = ['diff', '-u', path1, path2]
-          (output, status) = pipe(cmd)
-          diff = output.split(os.linesep)
-        else:
-          diff = None
-        failures.report('File contents differ for %s' % rel_path,
-                        details=diff)
-        ok = False
-        break
-      if len(data1) == 0:
-        # eof
-        break
-  finally:
-    file1.close()
-    file2.close()
+  if stat1.st_size != stat2.st_size:
+    # The contents must differ; don't bother reading them:
+    report_contents_differ(failures, base1, base2, run_diff, rel_path)
+    ok = False
+  elif not contents_equal(path1, path2):
+    report_contents_differ(failures, base1, base2, run_diff, rel_path)
+    ok = False
 
   return ok
 
@@ -418,50 +520,137 @@ def tree_compare(failures, base1, base2, run_diff, rel_path=''):
 
   The paths are specified as two base paths BASE1 and BASE2, and a
   path REL_PATH that is relative to the two base paths.  Return True
-  iff the trees are identical."""
+  iff the trees are identical.
 
-  if not rel_path:
-    path1 = base1
-    path2 = base2
-  else:
-    path1 = os.path.join(base1, rel_path)
-    path2 = os.path.join(base2, rel_path)
-  if not os.path.exists(path1):
-    failures.report('%s does not exist' % path1)
-    return False
-  if not os.path.exists(path2):
-    failures.report('%s does not exist' % path2)
-    return False
-  if os.path.isfile(path1) and os.path.isfile(path2):
-    return file_compare(failures, base1, base2, run_diff, rel_path)
-  if not (os.path.isdir(path1) and os.path.isdir(path2)):
-    failures.report('Path types differ for %r' % rel_path)
-    return False
-  entries1 = os.listdir(path1)
-  entries1.sort()
-  entries2 = os.listdir(path2)
-  entries2.sort()
+  The trees are walked depth-first using an explicit stack rather
+  than recursion, so arbitrarily deep trees can be compared."""
 
   ok = True
 
-  missing = filter(lambda x: x not in entries2, entries1)
-  extra = filter(lambda x: x not in entries1, entries2)
-  if missing:
-    failures.report('Directory /%s is missing entries: %s' %
-                    (rel_path, ', '.join(missing)))
-    ok = False
-  if extra:
-    failures.report('Directory /%s has extra entries: %s' %
-                    (rel_path, ', '.join(extra)))
-    ok = False
-
-  for entry in entries1:
-    new_rel_path = os.path.join(rel_path, entry)
-    if not tree_compare(failures, base1, base2, run_diff, new_rel_path):
+  # A stack of relative paths that still have to be compared.  Entries
+  # are pushed in reverse order so that paths are compared (and
+  # failures reported) in sorted order:
+  stack = collections.deque([rel_path])
+  while stack:
+    rel_path = stack.pop()
+    if not rel_path:
+      path1 = base1
+      path2 = base2
+    else:
+      path1 = os.path.join(base1, rel_path)
+      path2 = os.path.join(base2, rel_path)
+    # Stat each path only once, and reuse the result for all of the
+    # checks below:
+    try:
+      stat1 = os.stat(path1)
+    except OSError:
+      failures.report('%s does not exist' % path1)
+      ok = False
+      continue
+    try:
+      stat2 = os.stat(path2)
+    except OSError:
+      failures.report('%s does not exist' % path2)
       ok = False
+      continue
+    if stat.S_ISREG(stat1.st_mode) and stat.S_ISREG(stat2.st_mode):
+      if not file_compare(
+            failures, base1, base2, run_diff, rel_path, stat1, stat2
+            ):
+        ok = False
+      continue
+    if not (stat.S_ISDIR(stat1.st_mode) and stat.S_ISDIR(stat2.st_mode)):
+      failures.report('Path types differ for %r' % rel_path)
+      ok = False
+      continue
+    entries1 = set(os.listdir(path1))
+    entries2 = set(os.listdir(path2))
+
+    missing = sorted(entries1 - entries2)
+    extra = sorted(entries2 - entries1)
+    if missing:
+      failures.report('Directory /%s is missing entries: %s' %
+                      (rel_path, ', '.join(missing)))
+      ok = False
+    if extra:
+      failures.report('Directory /%s has extra entries: %s' %
+                      (rel_path, ', '.join(extra)))
+      ok = False
+
+    common = sorted(entries1 & entries2)
+    common.reverse()
+    stack.extend([os.path.join(rel_path, entry) for entry in common])
+
   return ok
 
 
+def diff_tree_compare(failures, base1, base2, run_diff):
+  """Compare the contents of two directory trees using 'diff -qr'.
+
+  This walks both trees in a single diff process rather than in
+  Python, so it is much faster than tree_compare() for large trees.
+  However, file modes are not compared.  Return True iff the trees
+  are identical."""
+
+  for path in [base1, base2]:
+    if not os.path.exists(path):
+      failures.report('%s does not exist' % path)
+      return False
+
+  def rel(path, base):
+    return path[len(base):].lstrip('/')
+
+  ok = True
+  cmd = [DIFF_CMD, '-qr', base1, base2]
+  # The output is parsed below, so make sure that it is not translated:
+  env = os.environ.copy()
+  env['LC_ALL'] = 'C'
+  child = subprocess.Popen(cmd, stdout=subprocess.PIPE, env=env)
+  for line in child.stdout:
+    line = line.rstrip('\n')
+    ok = False
+    if line.startswith('Only in '):
+      (parent, entry) = line[len('Only in '):].split(': ', 1)
+      if parent == base1 or parent.startswith(base1 + '/'):
+        failures.report('Directory /%s is missing entries: %s'
+                        % (rel(parent, base1), entry))
+      else:
+        failures.report('Directory /%s has extra entries: %s'
+                        % (rel(parent, base2), entry))
+    elif line.startswith('Files ') and line.endswith(' differ'):
+      # The line reads "Files BASE1/REL and BASE2/REL differ"; since
+      # REL appears twice, its length can be computed even if it
+      # contains " and ":
+      paths = line[len('Files '):-len(' differ')]
+      n = (len(paths) - len(base1) - len(base2) - len('/ and /')) // 2
+      rel_path = paths[len(base1) + 1:len(base1) + 1 + n]
+      report_contents_differ(failures, base1, base2, run_diff, rel_path)
+    elif line.startswith('File ') and ' while file ' in line:
+      path1 = line[len('File '):line.index(' is a ')]
+      failures.report('Path types differ for %r' % rel(path1, base1))
+    else:
+      failures.report(line)
+  status = child.wait()
+  if status > 1:
+    raise RuntimeError('%s command failed!' % cmd[0])
+  return ok
+
+
+def remove_tree(path):
+  """Delete the directory tree at PATH.
+
+  Use 'rm -rf' if possible, because it is much faster than
+  shutil.rmtree() for big trees."""
+
+  try:
+    status = subprocess.call([RM_CMD, '-rf', '--', path])
+  except OSError:
+    # No rm command (e.g., on Windows):
+    status = None
+  if status != 0 and os.path.exists(path):
+    shutil.rmtree(path)
+
+
 def verify_contents_single(failures, cvsrepos, verifyrepos, kind, label, ctx):
   """Verify the HEAD revision of a trunk, tag, or branch.
 
@@ -472,7 +661,9 @@ def verify_contents_single(failures, cvsrepos, verifyrepos, kind, label, ctx):
   specify the name of the tag or branch.  CTX has the attributes:
   CTX.tmpdir: specifying the directory for all temporary files.
   CTX.skip_cleanup: if true, the temporary files are not deleted.
-  CTX.run_diff: if true, run diff on differing files."""
+  CTX.run_diff: if true, run diff on differing files.
+  CTX.fast_compare: if true, compare the trees using diff_tree_compare().
+  CTX.jobs: if greater than 1, run the two exports concurrently."""
 
   itemname = kind + (kind != 'trunk' and '-' + label or '')
   cvs_export_dir = os.path.join(
@@ -485,8 +676,10 @@ def verify_contents_single(failures, cvsrepos, verifyrepos, kind, label, ctx):
   else:
     cvslabel = None
 
-  try:
+  def export_cvs():
     cvsrepos.export(cvs_export_dir, cvslabel, ctx.keyword_opt)
+
+  def export_vrf():
     if kind == 'trunk':
       verifyrepos.export_trunk(vrf_export_dir)
     elif kind == 'tag':
@@ -494,56 +687,126 @@ def verify_contents_single(failures, cvsrepos, verifyrepos, kind, label, ctx):
     else:
       verifyrepos.export_branch(vrf_export_dir, label)
 
-    if not tree_compare(
-          failures, cvs_export_dir, vrf_export_dir, ctx.run_diff
-          ):
+  try:
+    # The two exports are independent, so with --jobs, run them
+    # concurrently.  Otherwise (CTX.jobs == 1) run them one after the
+    # other, in this thread:
+    run_jobs(min(ctx.jobs, 2), [export_cvs, export_vrf])
+
+    if ctx.fast_compare:
+      compare = diff_tree_compare
+    else:
+      compare = tree_compare
+    if not compare(failures, cvs_export_dir, vrf_export_dir, ctx.run_diff):
       return False
   finally:
     if not ctx.skip_cleanup:
       if os.path.exists(cvs_export_dir):
-        shutil.rmtree(cvs_export_dir)
+        remove_tree(cvs_export_dir)
       if os.path.exists(vrf_export_dir):
-        shutil.rmtree(vrf_export_dir)
+        remove_tree(vrf_export_dir)
   return True
 
 
+def run_jobs(jobs, tasks):
+  """Call each of the callables in TASKS, using up to JOBS threads.
+
+  Return a list of their return values, in the same order as TASKS.
+  If a task raises an exception, or the calling thread is interrupted
+  (KeyboardInterrupt), no further tasks are started, and the exception
+  is re-raised once the tasks already running have finished."""
+
+  results = [None] * len(tasks)
+  if jobs <= 1:
+    for i in range(len(tasks)):
+      results[i] = tasks[i]()
+    return results
+
+  queue = Queue.Queue()
+  for i in range(len(tasks)):
+    queue.put(i)
+  errors = []
+
+  def worker():
+    while not errors:
+      try:
+        i = queue.get_nowait()
+      except Queue.Empty:
+        return
+      try:
+        results[i] = tasks[i]()
+      except:
+        errors.append(sys.exc_info())
+
+  threads = []
+  for i in range(min(jobs, len(tasks))):
+    thread = threading.Thread(target=worker)
+    thread.setDaemon(True)
+    thread.start()
+    threads.append(thread)
+
+  def join_threads():
+    for thread in threads:
+      # Join with a timeout so that KeyboardInterrupt gets through:
+      while thread.isAlive():
+        thread.join(1.0)
+
+  try:
+    join_threads()
+  except KeyboardInterrupt:
+    # The caller may clean up after the tasks (e.g., remove the
+    # directories that they export into), so don't start any more
+    # tasks, and wait for the running ones to stop before re-raising.
+    # Their child processes got the interrupt, too, so this should not
+    # take long:
+    errors.append(sys.exc_info())
+    join_threads()
+    raise
+
+  if errors:
+    (exc_type, exc_value, exc_traceback) = errors[0]
+    raise exc_type, exc_value, exc_traceback
+  return results
+
+
 def verify_contents(failures, cvsrepos, verifyrepos, ctx):
   """Verify that the contents of the HEAD revision of all directories
   and files in the trunk, all tags and all branches in the conversion
   repository VERIFYREPOS matches the ones in the CVS repository CVSREPOS.
-  CTX is passed through to verify_contents_single()."""
+  CTX is passed through to verify_contents_single().  Up to CTX.jobs
+  trunk/tags/branches are verified concurrently."""
 
-  # branches/tags that failed:
-  locations = []
-
-  # Verify contents of trunk
-  print 'Verifying trunk'
-  sys.stdout.flush()
-  if not verify_contents_single(
-        failures, cvsrepos, verifyrepos, 'trunk', None, ctx
-        ):
-    locations.append('trunk')
-
-  # Verify contents of all tags
+  # A list of (kind, label, location) for each item to be verified:
+  items = [('trunk', None, 'trunk')]
   for tag in verifyrepos.tags():
-    print 'Verifying tag', tag
-    sys.stdout.flush()
-    if not verify_contents_single(
-          failures, cvsrepos, verifyrepos, 'tag', tag, ctx
-          ):
-      locations.append('tag:' + tag)
-
-  # Verify contents of all branches
+    items.append(('tag', tag, 'tag:' + tag))
   for branch in verifyrepos.branches():
     if branch[:10] == 'unlabeled-':
-      print 'Skipped branch', branch
+      write('Skipped branch %s\n' % (branch,))
     else:
-      print 'Verifying branch', branch
-      if not verify_contents_single(
-            failures, cvsrepos, verifyrepos, 'branch', branch, ctx
-            ):
-        locations.append('branch:' + branch)
-    sys.stdout.flush()
+      items.append(('branch', branch, 'branch:' + branch))
+
+  def make_task(kind, label):
+    def task():
+      if label:
+        write('Verifying %s %s\n' % (kind, label,))
+      else:
+        write('Verifying %s\n' % (kind,))
+      return verify_contents_single(
+          failures, cvsrepos, verifyrepos, kind, label, ctx
+          )
+    return task
+
+  results = run_jobs(
+      ctx.jobs, [make_task(kind, label) for (kind, label, location) in items]
+      )
+
+  # branches/tags that failed:
+  locations = [
+      location
+      for ((kind, label, location), ok) in zip(items, results)
+      if not ok
+      ]
 
   assert bool(failures) == bool(locations), \
          "failures = %r\nlocations = %r" % (failures, locations)
@@ -570,14 +833,25 @@ def main(argv):
                     help='verify contents of the branch BRANCH only')
   parser.add_option('--diff', action='store_true', dest='run_diff',
                     help='run diff on differing files')
+  parser.add_option('--fast-compare', action='store_true',
+                    help='compare trees using a single "diff -qr" '
+                         '(faster, but does not compare file modes)')
+  parser.add_option('--jobs', '-j', type='int',
+                    metavar='N',
+                    help='verify up to N trunk/tags/branches at once; '
+                         'if N > 1, the CVS and verify-repos exports of '
+                         'each also run concurrently, so up to 2*N export '
+                         'commands may run at once [default: 1]')
   parser.add_option('--tag',
                     help='verify contents of the tag TAG only')
   parser.add_option('--tmpdir',
                     metavar='PATH',
-                    help='path to store temporary files')
+                    help='path to store temporary files (a tmpfs like '
+                         '/dev/shm is fastest, if it is big enough)')
   parser.add_option('--trunk', action='store_true',
                     help='verify contents of trunk only')
-  parser.add_option('--symbol-transform', action='append',
+  parser.add_option('--symbol-transform',
+                    action='append', dest='symbol_transforms',
                     metavar='P:S',
                     help='transform symbol names from P to S like cvs2svn, '
                          'except transforms SVN symbol to CVS symbol')
@@ -600,21 +874,28 @@ def main(argv):
                          'cvs export command line')
 
   parser.set_defaults(run_diff=False,
+                      fast_compare=False,
+                      jobs=1,
                       tmpdir='',
                       skip_cleanup=False,
                       symbol_transforms=[],
                       repos_type='svn')
   (options, args) = parser.parse_args()
 
+  # Compile the symbol transforms once, up front.  As in cvs2svn, the
+  # pattern has to match the whole symbol name:
   symbol_transforms = []
   for value in options.symbol_transforms:
-    # This is broken!
-    [pattern, replacement] = value.split(":")
+    try:
+      [pattern, replacement] = value.split(':', 1)
+    except ValueError:
+      parser.error("'%s' is not of the form 'P:S'." % (value,))
     try:
       symbol_transforms.append(
-          RegexpSymbolTransform(pattern, replacement))
+          (re.compile('^' + pattern + '$'), replacement))
     except re.error:
       parser.error("'%s' is not a valid regexp." % (pattern,))
+  options.symbol_transforms = symbol_transforms
 
   def error(msg):
     """Print an error to sys.stderr."""
@@ -627,6 +908,8 @@ def main(argv):
   # Consistency check for options and arguments.
   if len(args) != 2:
     parser.error("wrong number of arguments")
+  if options.jobs < 1:
+    parser.error("--jobs must be at least 1")
 
   cvs_path = args[0]
   verify_path = args[1]
@@ -13,6 +13,7 @@
 # ====================================================================
 
 import os
+import stat
 import tempfile
 import errno
 
@@ -48,17 +49,23 @@ def main(progname, run_options, pass_manager):
       'Be sure to use --tmpdir=%r if you need to resume this conversion.'
       % (ctx.tmpdir, ctx.tmpdir,),
       )
-  elif not os.path.exists(ctx.tmpdir):
-    os.mkdir(ctx.tmpdir)
-    erase_tmpdir = True
-  elif not os.path.isdir(ctx.tmpdir):
-    raise FatalError(
-        "cvs2svn tried to use '%s' for temporary files, but that path\n"
-        "  exists and is not a directory.  Please make it be a directory,\n"
-        "  or specify some other directory for temporary files."
-        % (ctx.tmpdir,))
   else:
-    erase_tmpdir = False
+    try:
+      tmpdir_stat = os.stat(ctx.tmpdir)
+    except OSError:
+      tmpdir_stat = None
+
+    if tmpdir_stat is None:
+      os.mkdir(ctx.tmpdir)
+      erase_tmpdir = True
+    elif not stat.S_ISDIR(tmpdir_stat.st_mode):
+      raise FatalError(
+          "cvs2svn tried to use '%s' for temporary files, but that path\n"
+          "  exists and is not a directory.  Please make it be a directory,\n"
+          "  or specify some other directory for temporary files."
+          % (ctx.tmpdir,))
+    else:
+      erase_tmpdir = False
 
   # But do lock the tmpdir, to avoid process clash.
   try:
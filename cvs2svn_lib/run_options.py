@@ -120,19 +120,20 @@ class ContextOption(ManOption):
 
     action = self.__action
     dest = self.__dest
+    ctx = Ctx()
 
     if action == "store":
-        setattr(Ctx(), dest, value)
+        setattr(ctx, dest, value)
     elif action == "store_const":
-        setattr(Ctx(), dest, self.__const)
+        setattr(ctx, dest, self.__const)
     elif action == "store_true":
-        setattr(Ctx(), dest, True)
+        setattr(ctx, dest, True)
     elif action == "store_false":
-        setattr(Ctx(), dest, False)
+        setattr(ctx, dest, False)
     elif action == "append":
-        getattr(Ctx(), dest).append(value)
+        getattr(ctx, dest).append(value)
     elif action == "count":
-        setattr(Ctx(), dest, getattr(Ctx(), dest, 0) + 1)
+        setattr(ctx, dest, getattr(ctx, dest, 0) + 1)
     else:
         raise RuntimeError("unknown action %r" % self.__action)
 
@@ -922,8 +923,9 @@ class RunOptions(object):
     logger.decrease_verbosity()
 
   def callback_passes(self, option, opt_str, value, parser):
-    if value.find(':') >= 0:
-      start_pass, end_pass = value.split(':')
+    parts = value.split(':', 1)
+    if len(parts) == 2:
+      (start_pass, end_pass) = parts
       self.start_pass = self.pass_manager.get_pass_number(start_pass, 1)
       self.end_pass = self.pass_manager.get_pass_number(
           end_pass, self.pass_manager.num_passes
@@ -958,7 +960,12 @@ class RunOptions(object):
     Ctx().revision_property_setters.append(CVSRevisionNumberSetter())
 
   def callback_symbol_transform(self, option, opt_str, value, parser):
-    [pattern, replacement] = value.split(":")
+    parts = value.split(':', 1)
+    if len(parts) != 2:
+      raise FatalError(
+          "'%s' is not of the form PATTERN:REPLACEMENT." % (value,)
+          )
+    (pattern, replacement) = parts
     try:
       parser.values.symbol_transforms.append(
           RegexpSymbolTransform(pattern, replacement)
@@ -992,6 +999,16 @@ class RunOptions(object):
       ctx.revision_collector = InternalRevisionCollector(compress=True)
       ctx.revision_reader = InternalRevisionReader(compress=True)
 
+  # A map {--symbol-default value : [SymbolStrategyRule class, ...]}
+  # listing the rules to add, in order, for each choice of that option:
+  _symbol_default_rules = {
+      'strict' : [],
+      'branch' : [AllBranchRule],
+      'tag' : [AllTagRule],
+      'heuristic' : [BranchIfCommitsRule, HeuristicStrategyRule],
+      'exclude' : [AllExcludedRule],
+      }
+
   def process_symbol_strategy_options(self):
     """Process symbol strategy-related options."""
 
@@ -1014,19 +1031,8 @@ class RunOptions(object):
         options.symbol_strategy_rules.append(ExcludeTrivialImportBranchRule())
 
       options.symbol_strategy_rules.append(UnambiguousUsageRule())
-      if options.symbol_default == 'strict':
-        pass
-      elif options.symbol_default == 'branch':
-        options.symbol_strategy_rules.append(AllBranchRule())
-      elif options.symbol_default == 'tag':
-        options.symbol_strategy_rules.append(AllTagRule())
-      elif options.symbol_default == 'heuristic':
-        options.symbol_strategy_rules.append(BranchIfCommitsRule())
-        options.symbol_strategy_rules.append(HeuristicStrategyRule())
-      elif options.symbol_default == 'exclude':
-        options.symbol_strategy_rules.append(AllExcludedRule())
-      else:
-        assert False
+      for rule_class in self._symbol_default_rules[options.symbol_default]:
+        options.symbol_strategy_rules.append(rule_class())
 
       # Now add a rule whose job it is to pick the preferred parents of
       # branches and tags:
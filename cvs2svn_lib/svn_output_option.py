@@ -198,7 +198,8 @@ class SVNOutputOption(OutputOption):
       self.delete_lod(lod)
       return
 
-    logger.verbose("  Deleting %s" % (lod.get_path(cvs_path.cvs_path),))
+    if logger.is_on(logger.VERBOSE):
+      logger.verbose("  Deleting %s" % (lod.get_path(cvs_path.cvs_path),))
     parent_node = self._mirror.get_current_path(
         cvs_path.parent_directory, lod
         )
@@ -218,7 +219,10 @@ class SVNOutputOption(OutputOption):
         else:
           parent_node = node.parent_mirror_dir
           node.delete()
-          logger.verbose("  Deleting %s" % (lod.get_path(cvs_path.cvs_path),))
+          if logger.is_on(logger.VERBOSE):
+            logger.verbose(
+                "  Deleting %s" % (lod.get_path(cvs_path.cvs_path),)
+                )
           self._invoke_delegates('delete_path', lod, cvs_path)
 
   def initialize_project(self, project):
@@ -237,7 +241,8 @@ class SVNOutputOption(OutputOption):
   def change_path(self, cvs_rev):
     """Register a change in self._youngest for the CVS_REV's svn_path."""
 
-    logger.verbose("  Changing %s" % (cvs_rev.get_svn_path(),))
+    if logger.is_on(logger.VERBOSE):
+      logger.verbose("  Changing %s" % (cvs_rev.get_svn_path(),))
     # We do not have to update the nodes because our mirror is only
     # concerned with the presence or absence of paths, and a file
     # content change does not cause any path changes.
@@ -300,7 +305,8 @@ class SVNOutputOption(OutputOption):
     parent_path = cvs_file.parent_directory
     lod = cvs_rev.lod
     parent_node = self._mkdir_p(parent_path, lod)
-    logger.verbose("  Adding %s" % (cvs_rev.get_svn_path(),))
+    if logger.is_on(logger.VERBOSE):
+      logger.verbose("  Adding %s" % (cvs_rev.get_svn_path(),))
     parent_node.add_file(cvs_file)
     self._invoke_delegates('add_path', cvs_rev)
 
@@ -550,7 +556,10 @@ class SVNOutputOption(OutputOption):
     # order:
     delete_list.sort()
     for cvs_path in delete_list:
-      logger.verbose("  Deleting %s" % (symbol.get_path(cvs_path.cvs_path),))
+      if logger.is_on(logger.VERBOSE):
+        logger.verbose(
+            "  Deleting %s" % (symbol.get_path(cvs_path.cvs_path),)
+            )
       del dest_node[cvs_path]
       self._invoke_delegates('delete_path', symbol, cvs_path)
 
@@ -582,63 +591,119 @@ class SVNOutputOption(OutputOption):
 
     self.end_commit()
 
+  def _delete_revision(self, cvs_rev):
+    """Delete the file that is deleted by CVS_REV from its LOD."""
+
+    self.delete_path(cvs_rev.cvs_file, cvs_rev.lod, Ctx().prune)
+
+  def _skip_revision(self, cvs_rev):
+    """Do nothing for CVS_REV."""
+
+    pass
+
+  def _get_revision_method(self, methods, cvs_rev):
+    """Return the bound method that handles CVS_REV, or None.
+
+    METHODS is a map {CVSRevision subtype : method name}.  Instances of
+    subclasses of those types are handled like instances of the type
+    itself.  The method is looked up on SELF, so overrides in
+    subclasses of this class are respected."""
+
+    try:
+      name = methods[type(cvs_rev)]
+    except KeyError:
+      for (cls, name) in methods.items():
+        if isinstance(cvs_rev, cls):
+          # Remember the answer for the next revision of this type:
+          methods[type(cvs_rev)] = name
+          break
+      else:
+        return None
+
+    return getattr(self, name)
+
+  # A map {CVSRevision subtype : method name}, naming the method that
+  # commits a CVSRevision of that type as part of a primary commit.
+  # Looking the type up in a dict is cheaper than a chain of
+  # isinstance() tests, which matters because it is done for every
+  # CVSRevision in the conversion:
+  _primary_commit_methods = {
+      CVSRevisionAdd : 'add_path',
+      CVSRevisionChange : 'change_path',
+      CVSRevisionDelete : '_delete_revision',
+      CVSRevisionNoop : '_skip_revision',
+      }
+
   def process_primary_commit(self, svn_commit):
     self.start_commit(svn_commit.revnum, self._get_revprops(svn_commit))
 
     # This actually commits CVSRevisions
-    if len(svn_commit.cvs_revs) > 1:
-      plural = "s"
-    else:
-      plural = ""
-    logger.verbose("Committing %d CVSRevision%s"
-                  % (len(svn_commit.cvs_revs), plural))
+    if logger.is_on(logger.VERBOSE):
+      if len(svn_commit.cvs_revs) > 1:
+        plural = "s"
+      else:
+        plural = ""
+      logger.verbose("Committing %d CVSRevision%s"
+                    % (len(svn_commit.cvs_revs), plural))
     for cvs_rev in svn_commit.cvs_revs:
-      if isinstance(cvs_rev, CVSRevisionNoop):
-        pass
+      method = self._get_revision_method(self._primary_commit_methods, cvs_rev)
+      if method is not None:
+        method(cvs_rev)
+
+    self.end_commit()
 
-      elif isinstance(cvs_rev, CVSRevisionDelete):
-        self.delete_path(cvs_rev.cvs_file, cvs_rev.lod, Ctx().prune)
+  def _post_add_revision(self, cvs_rev, motivating_revnum):
+    """Copy the file added by CVS_REV from its branch to trunk."""
 
-      elif isinstance(cvs_rev, CVSRevisionAdd):
-        self.add_path(cvs_rev)
+    trunk = cvs_rev.cvs_file.project.get_trunk()
+    self.copy_path(
+        cvs_rev.cvs_file, cvs_rev.lod, trunk, motivating_revnum, True
+        )
 
-      elif isinstance(cvs_rev, CVSRevisionChange):
-        self.change_path(cvs_rev)
+  def _post_change_revision(self, cvs_rev, motivating_revnum):
+    """Replace the trunk version of the file changed by CVS_REV."""
 
-    self.end_commit()
+    trunk = cvs_rev.cvs_file.project.get_trunk()
+    # Delete old version of the path on trunk...
+    self.delete_path(cvs_rev.cvs_file, trunk)
+    # ...and copy the new version over from branch:
+    self.copy_path(
+        cvs_rev.cvs_file, cvs_rev.lod, trunk, motivating_revnum, True
+        )
+
+  def _post_delete_revision(self, cvs_rev, motivating_revnum):
+    """Delete the trunk version of the file deleted by CVS_REV."""
+
+    self.delete_path(cvs_rev.cvs_file, cvs_rev.cvs_file.project.get_trunk())
+
+  def _post_skip_revision(self, cvs_rev, motivating_revnum):
+    """Do nothing for CVS_REV."""
+
+    pass
+
+  # A map {CVSRevision subtype : method name}, naming the method, called
+  # as METHOD(cvs_rev, motivating_revnum), that copies a CVSRevision of
+  # that type from a vendor branch to trunk as part of a post commit:
+  _post_commit_methods = {
+      CVSRevisionAdd : '_post_add_revision',
+      CVSRevisionChange : '_post_change_revision',
+      CVSRevisionDelete : '_post_delete_revision',
+      CVSRevisionNoop : '_post_skip_revision',
+      }
 
   def process_post_commit(self, svn_commit):
     self.start_commit(svn_commit.revnum, self._get_revprops(svn_commit))
 
     logger.verbose(
-        'Synchronizing default branch motivated by %d'
-        % (svn_commit.motivating_revnum,)
+        'Synchronizing default branch motivated by',
+        svn_commit.motivating_revnum,
         )
 
     for cvs_rev in svn_commit.cvs_revs:
-      trunk = cvs_rev.cvs_file.project.get_trunk()
-      if isinstance(cvs_rev, CVSRevisionAdd):
-        # Copy from branch to trunk:
-        self.copy_path(
-            cvs_rev.cvs_file, cvs_rev.lod, trunk,
-            svn_commit.motivating_revnum, True
-            )
-      elif isinstance(cvs_rev, CVSRevisionChange):
-        # Delete old version of the path on trunk...
-        self.delete_path(cvs_rev.cvs_file, trunk)
-        # ...and copy the new version over from branch:
-        self.copy_path(
-            cvs_rev.cvs_file, cvs_rev.lod, trunk,
-            svn_commit.motivating_revnum, True
-            )
-      elif isinstance(cvs_rev, CVSRevisionDelete):
-        # Delete trunk path:
-        self.delete_path(cvs_rev.cvs_file, trunk)
-      elif isinstance(cvs_rev, CVSRevisionNoop):
-        # Do nothing
-        pass
-      else:
+      method = self._get_revision_method(self._post_commit_methods, cvs_rev)
+      if method is None:
         raise InternalError('Unexpected CVSRevision type: %s' % (cvs_rev,))
+      method(cvs_rev, svn_commit.motivating_revnum)
 
     self.end_commit()
 
@@ -804,16 +869,17 @@ class NewRepositoryOutputOption(RepositoryOutputOption):
     elif not self.bdb_txn_nosync and os.path.exists(db_config):
       no_sync = 'set_flags DB_TXN_NOSYNC\n'
 
-      f = open(db_config, 'r')
-      contents = f.readlines()
-      f.close()
-
-      index = contents.index(no_sync)
-      contents[index] = '# ' + no_sync
-
-      f = open(db_config, 'w')
-      f.writelines(contents)
-      f.close()
+      f = open(db_config, 'r+')
+      try:
+        contents = f.read()
+        # Find the start of the first line that is exactly NO_SYNC:
+        index = ('\n' + contents).find('\n' + no_sync)
+        if index != -1:
+          f.seek(0)
+          f.write(contents[:index] + '# ' + contents[index:])
+          f.truncate()
+      finally:
+        f.close()
 
 
 class ExistingRepositoryOutputOption(RepositoryOutputOption):
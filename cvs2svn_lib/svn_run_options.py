@@ -381,6 +381,21 @@ A directory under \\fI%s\\fR (or the directory specified by
     """Process options related to extracting data from the CVS repository."""
     self.process_all_extraction_options()
 
+  # Pairs of output options that cannot be used together, as tuples
+  # (dest1, name1, dest2, name2), where DEST is the attribute under
+  # which optparse stores the option and NAME is how it is spelled in
+  # error messages:
+  _incompatible_output_options = [
+      ('svnrepos', '-s', 'dumpfile', '--dumpfile'),
+      ('dumpfile', '--dumpfile', 'existing_svnrepos', '--existing-svnrepos'),
+      (
+          'bdb_txn_nosync', '--bdb-txn-nosync',
+          'existing_svnrepos', '--existing-svnrepos',
+          ),
+      ('dumpfile', '--dumpfile', 'bdb_txn_nosync', '--bdb-txn-nosync'),
+      ('fs_type', '--fs-type', 'existing_svnrepos', '--existing-svnrepos'),
+      ]
+
   def process_output_options(self):
     """Process the options related to SVN output."""
 
@@ -393,20 +408,8 @@ A directory under \\fI%s\\fR (or the directory specified by
     if not options.svnrepos and not options.dumpfile and not ctx.dry_run:
       raise FatalError("must pass one of '-s' or '--dumpfile'.")
 
-    not_both(options.svnrepos, '-s',
-             options.dumpfile, '--dumpfile')
-
-    not_both(options.dumpfile, '--dumpfile',
-             options.existing_svnrepos, '--existing-svnrepos')
-
-    not_both(options.bdb_txn_nosync, '--bdb-txn-nosync',
-             options.existing_svnrepos, '--existing-svnrepos')
-
-    not_both(options.dumpfile, '--dumpfile',
-             options.bdb_txn_nosync, '--bdb-txn-nosync')
-
-    not_both(options.fs_type, '--fs-type',
-             options.existing_svnrepos, '--existing-svnrepos')
+    for (dest1, name1, dest2, name2) in self._incompatible_output_options:
+      not_both(getattr(options, dest1), name1, getattr(options, dest2), name2)
 
     if (
           options.fs_type
@@ -495,8 +498,9 @@ A directory under \\fI%s\\fR (or the directory specified by
     RunOptions.process_property_setter_options(self)
 
     # Property setters for internal use:
-    Ctx().file_property_setters.append(SVNEOLFixPropertySetter())
-    Ctx().file_property_setters.append(SVNKeywordHandlingPropertySetter())
+    ctx = Ctx()
+    ctx.file_property_setters.append(SVNEOLFixPropertySetter())
+    ctx.file_property_setters.append(SVNKeywordHandlingPropertySetter())
 
   def process_options(self):
     # Consistency check for options and arguments.
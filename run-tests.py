@@ -4071,6 +4071,33 @@ def vendor_1_1_not_root():
       )
 
 
+@Cvs2SvnTestFunction
+def symbol_transform_malformed():
+  "reject a --symbol-transform without a colon"
+
+  ensure_conversion(
+      'symbol-mess',
+      args=[
+          '--symbol-transform=BRANCH',
+          ],
+      error_re=r'.*is not of the form PATTERN:REPLACEMENT',
+      )
+
+
+@Cvs2SvnTestFunction
+def symbol_transform_colon():
+  "allow a colon in the --symbol-transform replacement"
+
+  conv = ensure_conversion(
+      'symbol-mess',
+      args=[
+          '--symbol-default=heuristic',
+          '--symbol-transform=BRANCH:branch:1',
+          ])
+  if not conv.path_exists('branches', 'branch:1'):
+     raise Failure()
+
+
 ########################################################################
 # Run the tests
 
@@ -4290,6 +4317,8 @@ test_list = [
     missing_vendor_branch,
     newphrases,
     vendor_1_1_not_root,
+    symbol_transform_malformed,
+    symbol_transform_colon,
     ]
 
 if __name__ == '__main__':